@@ -140,7 +140,7 @@ func (s *Server) handleRequest(w stdhttp.ResponseWriter, r *stdhttp.Request) {
 func (s *Server) routeAdminTenantPath(w stdhttp.ResponseWriter, r *stdhttp.Request) {
 	path := strings.Trim(r.URL.Path, "/")
 	parts := strings.Split(path, "/")
-	if len(parts) < 4 || parts[0] != "admin" || parts[1] != "tenants" {
+	if len(parts) < 3 || parts[0] != "admin" || parts[1] != "tenants" {
 		writeError(w, stdhttp.StatusNotFound, "not_found", "Endpoint not found")
 		return
 	}
@@ -148,6 +148,11 @@ func (s *Server) routeAdminTenantPath(w stdhttp.ResponseWriter, r *stdhttp.Reque
 	tenantID := parts[2]
 	r.SetPathValue("tenant_id", tenantID)
 
+	if len(parts) == 3 && r.Method == stdhttp.MethodGet {
+		s.withAdminAuth(s.adminHandlers.GetTenant)(w, r)
+		return
+	}
+
 	if len(parts) == 4 && parts[3] == "users" {
 		switch r.Method {
 		case stdhttp.MethodGet:
@@ -160,6 +165,12 @@ func (s *Server) routeAdminTenantPath(w stdhttp.ResponseWriter, r *stdhttp.Reque
 		return
 	}
 
+	if len(parts) == 5 && parts[3] == "users" && r.Method == stdhttp.MethodGet {
+		r.SetPathValue("user_id", parts[4])
+		s.withAdminAuth(s.adminHandlers.GetUser)(w, r)
+		return
+	}
+
 	if len(parts) == 6 && parts[3] == "users" && parts[5] == "password" && r.Method == stdhttp.MethodPut {
 		r.SetPathValue("user_id", parts[4])
 		s.withAdminAuth(s.adminHandlers.SetUserPassword)(w, r)
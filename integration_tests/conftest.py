@@ -1,11 +1,39 @@
+# pytest-antilru clears functools.lru_cache caches defined under integration_tests/
+# (see lru_cache_disabled in pytest.ini) after every test; third-party caches are untouched.
+import base64
+import hashlib
 import os
 import secrets
-import uuid
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
 import pytest
 import requests
+import requests.models
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_dumps(obj: Any, **_: Any) -> bytes:
+    # Stand-in for json.dumps inside requests. Non-str dict keys are stringified
+    # like the stdlib does, and encode errors are raised as ValueError so requests
+    # still wraps them in InvalidJSONError. requests' allow_nan=False is not
+    # honoured: orjson writes NaN/Infinity as null, and checking for them in
+    # Python would cost more than the C encoder saves. The suite never sends them.
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError as exc:
+        raise ValueError(str(exc)) from exc
+
+
+if orjson is not None:
+    # Route both Response.json() and json= request bodies through orjson.
+    requests.models.complexjson = SimpleNamespace(loads=orjson.loads, dumps=_orjson_dumps)
 
 
 @dataclass(frozen=True)
@@ -18,14 +46,38 @@ class IntegrationConfig:
     seeded_client_id: str
     seeded_redirect_uri: str
     seeded_scope: str
+    probe_login_page: bool
+    tenants_url: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "tenants_url", f"{self.base_url}/admin/tenants")
+
+    def tenant_url(self, tenant_id: str) -> str:
+        return f"{self.tenants_url}/{tenant_id}"
+
+    def tenant_users_url(self, tenant_id: str) -> str:
+        return f"{self.tenants_url}/{tenant_id}/users"
+
+    def tenant_user_url(self, tenant_id: str, user_id: str) -> str:
+        return f"{self.tenants_url}/{tenant_id}/users/{user_id}"
+
+    def tenant_user_password_url(self, tenant_id: str, user_id: str) -> str:
+        return f"{self.tenants_url}/{tenant_id}/users/{user_id}/password"
 
 
 def _trim_url(url: str) -> str:
     return url.rstrip("/")
 
 
-@pytest.fixture(scope="session")
-def config() -> IntegrationConfig:
+def _id_stream() -> Iterator[str]:
+    # One entropy draw yields 1024 ids of 32 bits each; refill when exhausted.
+    while True:
+        blob = secrets.token_hex(4096)
+        for i in range(0, len(blob), 8):
+            yield blob[i : i + 8]
+
+
+def _build_config() -> IntegrationConfig:
     base_url = _trim_url(os.getenv("LOCKY_BASE_URL", "http://localhost:8080"))
     admin_api_key = os.getenv("LOCKY_ADMIN_API_KEY", "test-admin-key-123")
     tenant_host = os.getenv("LOCKY_TENANT_HOST", "localhost")
@@ -39,36 +91,170 @@ def config() -> IntegrationConfig:
         seeded_client_id=os.getenv("LOCKY_SEEDED_CLIENT_ID", "test-client-id"),
         seeded_redirect_uri=os.getenv("LOCKY_SEEDED_REDIRECT_URI", "http://localhost:3000/callback"),
         seeded_scope=os.getenv("LOCKY_SEEDED_SCOPE", "openid profile email"),
+        probe_login_page=os.getenv("LOCKY_OAUTH_PROBE_GET", "").lower() in ("1", "true", "yes"),
     )
 
 
+class _LockySession(requests.Session):
+    def request(self, *args: Any, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", 10)
+        return super().request(*args, **kwargs)
+
+
+def _build_session(config: IntegrationConfig) -> requests.Session:
+    # HTTP/1.1 keep-alive is the ceiling here: locky serves plain-text HTTP via
+    # http.ListenAndServe, and clients such as httpx only negotiate HTTP/2 over
+    # TLS (ALPN), so an HTTP/2 client would not multiplex anything.
+    s = _LockySession()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    s.headers.update({"Accept": "application/json", "Host": config.tenant_host, "Connection": "keep-alive"})
+    return s
+
+
+def _check_health(s: requests.Session, config: IntegrationConfig) -> None:
+    try:
+        r = s.get(f"{config.base_url}/healthz", timeout=5)
+    except requests.RequestException as exc:
+        pytest.exit(f"Service not reachable at {config.base_url}: {exc}", returncode=pytest.ExitCode.TESTS_FAILED)
+    if r.status_code != 200:
+        pytest.exit(f"Service not healthy: {r.status_code} {r.text}", returncode=pytest.ExitCode.TESTS_FAILED)
+
+
+def _probe_seeded_environment(
+    s: requests.Session, config: IntegrationConfig
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    try:
+        tenants_resp = s.get(
+            config.tenants_url,
+            headers={"X-Admin-Key": config.admin_api_key},
+        )
+    except requests.RequestException as exc:
+        return [], f"Could not list tenants: {exc}"
+    if tenants_resp.status_code != 200:
+        return [], f"Could not list tenants: {tenants_resp.status_code} {tenants_resp.text}"
+
+    try:
+        tenants = tenants_resp.json().get("tenants", [])
+    except ValueError as exc:
+        return [], f"Could not decode tenant list: {exc}"
+    if not any(t.get("slug") == "test" for t in tenants):
+        return (
+            [],
+            "Seeded tenant not found. Run with docker compose seed or set env vars for pre-seeded test tenant/client.",
+        )
+    return tenants, None
+
+
+_CONFIG_KEY = pytest.StashKey[IntegrationConfig]()
+_SESSION_KEY = pytest.StashKey[requests.Session]()
+_SEEDED_KEY = pytest.StashKey[Tuple[List[Dict[str, Any]], Optional[str]]]()
+
+
+def _runs_tests(config: pytest.Config) -> bool:
+    option = config.option
+    return not (
+        option.collectonly
+        or getattr(option, "showfixtures", False)
+        or getattr(option, "show_fixtures_per_test", False)
+        or getattr(option, "setupplan", False)
+    )
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    # Each process (including every xdist worker) builds exactly one config and
+    # pooled HTTP session here, so fixtures below only read from the stash.
+    cfg = _build_config()
+    s = _build_session(cfg)
+    session.config.stash[_CONFIG_KEY] = cfg
+    session.config.stash[_SESSION_KEY] = s
+    if not _runs_tests(session.config):
+        return
+    is_worker = hasattr(session.config, "workerinput")
+    if not is_worker:
+        # Checked once, before xdist spawns workers, so an unhealthy service fails
+        # the run from the controller instead of from each worker.
+        _check_health(s, cfg)
+    if not is_worker and session.config.getoption("numprocesses", None):
+        # xdist controller: it runs no tests, so the seeded probe is left to workers.
+        return
+    session.config.stash[_SEEDED_KEY] = _probe_seeded_environment(s, cfg)
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    s = session.config.stash.get(_SESSION_KEY, None)
+    if s is not None:
+        s.close()
+
+
+@pytest.fixture(scope="session")
+def config(pytestconfig: pytest.Config) -> IntegrationConfig:
+    return pytestconfig.stash[_CONFIG_KEY]
+
+
+@pytest.fixture(scope="session")
+def session(pytestconfig: pytest.Config) -> requests.Session:
+    return pytestconfig.stash[_SESSION_KEY]
+
+
 @pytest.fixture(scope="session")
-def session(config: IntegrationConfig) -> requests.Session:
-    s = requests.Session()
-    s.headers.update({"Accept": "application/json", "Host": config.tenant_host})
-    yield s
-    s.close()
+def admin_headers(config: IntegrationConfig) -> Mapping[str, str]:
+    return MappingProxyType({"X-Admin-Key": config.admin_api_key, "Content-Type": "application/json"})
 
 
 @pytest.fixture(scope="session")
-def admin_headers(config: IntegrationConfig) -> Dict[str, str]:
-    return {"X-Admin-Key": config.admin_api_key, "Content-Type": "application/json"}
+def admin_headers_get(config: IntegrationConfig) -> Mapping[str, str]:
+    return MappingProxyType({"X-Admin-Key": config.admin_api_key})
 
 
 @pytest.fixture(scope="session")
-def require_service_up(session: requests.Session, config: IntegrationConfig) -> None:
-    r = session.get(f"{config.base_url}/healthz", timeout=5)
-    assert r.status_code == 200, f"Service not healthy: {r.status_code} {r.text}"
+def seeded_environment(pytestconfig: pytest.Config) -> List[Dict[str, Any]]:
+    tenants, skip_reason = pytestconfig.stash[_SEEDED_KEY]
+    if skip_reason is not None:
+        pytest.skip(skip_reason)
+    return tenants
+
+
+@pytest.fixture(scope="session")
+def oidc_discovery(
+    session: requests.Session, config: IntegrationConfig, seeded_environment: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    r = session.get(f"{config.base_url}/.well-known/openid-configuration")
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+@pytest.fixture(scope="session")
+def _id_pool() -> Iterator[str]:
+    return _id_stream()
+
+
+@pytest.fixture(scope="module")
+def shared_tenant(
+    session: requests.Session,
+    config: IntegrationConfig,
+    admin_headers: Mapping[str, str],
+    _id_pool: Iterator[str],
+) -> Dict[str, Any]:
+    # Read-only tests share this tenant; write-path tests create their own via unique_slug.
+    r = session.post(
+        config.tenants_url,
+        headers=admin_headers,
+        json={"slug": f"py-it-shared-{next(_id_pool)}", "name": "Python Integration Shared Tenant"},
+    )
+    assert r.status_code == 201, r.text
+    return r.json()
 
 
 @pytest.fixture
-def unique_slug() -> str:
-    return f"py-it-{uuid.uuid4().hex[:8]}"
+def unique_slug(_id_pool: Iterator[str]) -> str:
+    return f"py-it-{next(_id_pool)}"
 
 
 @pytest.fixture
-def unique_email() -> str:
-    return f"py-it-{uuid.uuid4().hex[:8]}@example.com"
+def unique_email(_id_pool: Iterator[str]) -> str:
+    return f"py-it-{next(_id_pool)}@example.com"
 
 
 @pytest.fixture
@@ -79,3 +265,11 @@ def oauth_state() -> str:
 @pytest.fixture
 def oauth_nonce() -> str:
     return secrets.token_urlsafe(16)
+
+
+@pytest.fixture(scope="session")
+def pkce_pair() -> Tuple[str, str]:
+    verifier = secrets.token_urlsafe(64)
+    digest = hashlib.sha256(verifier.encode("utf-8")).digest()
+    challenge = base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+    return verifier, challenge